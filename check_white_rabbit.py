@@ -24,43 +24,248 @@
 # noqa: E501
 
 import argparse
-import subprocess
+import os
+import pickle
 import sys
+import time
+from functools import partial
+from itertools import compress
+
+# Imported on first use so --help and usage errors don't load Net-SNMP
+netsnmp = None
+
+#
+# --- OUTPUT HELPERS ---
+#
+
+
+def _emit(code, line):
+    """Print the plugin output and exit with code.
+       os._exit skips interpreter teardown, which Nagios would otherwise
+       wait for on every check."""
+    sys.stdout.write(line)
+    sys.stdout.write('\n')
+    sys.stdout.flush()
+    os._exit(code)
 
-import netsnmp
 
 #
 # --- SNMP HELPERS ---
 #
 
 
+class SnmpError(Exception):
+    """An SNMP request failed; the message is the UNKNOWN plugin output."""
+
+
+SNMP_VERSION = 2
+
+# Sessions are reused for every request to the same agent
+_SESSIONS = {}
+
+# Rows per column requested in one GETBULK; kept small to avoid tooBig
+SNMP_MAX_REPETITIONS = 10
+
+# Varbind types that end a column instead of carrying a value
+SNMP_END_TYPES = ('ENDOFMIBVIEW', 'NOSUCHOBJECT', 'NOSUCHINSTANCE')
+
+# VarLists per OID set, built once and reset before each reuse
+_VARLISTS = {}
+
+# Scalar values fetched ahead of time for several modes, per (host, community)
+_PREFETCHED = {}
+
+
+def _get_session(host, community, version=SNMP_VERSION):
+    global netsnmp
+    if netsnmp is None:
+        try:
+            import netsnmp
+        except ImportError as e:
+            raise SnmpError(f'UNKNOWN - netsnmp python bindings not available: {e}') from e
+
+    key = (host, community, version)
+    if key not in _SESSIONS:
+        # Numeric OIDs and raw values skip MIB translation on every reply
+        _SESSIONS[key] = netsnmp.Session(
+            DestHost=host, Version=version, Community=community,
+            UseNumeric=1, UseSprintValue=0
+        )
+    return _SESSIONS[key]
+
+
+def _decode(val):
+    return val.decode(errors='replace') if isinstance(val, bytes) else val
+
+
+def _varlist(oids):
+    varlist = _VARLISTS.get(oids)
+    if varlist is None:
+        varlist = netsnmp.VarList(*[netsnmp.Varbind(oid, '') for oid in oids])
+        _VARLISTS[oids] = varlist
+    else:
+        for vb in varlist:
+            vb.val = None
+    return varlist
+
+
 def snmp_get(host, community, oid):
-    var = netsnmp.VarList(netsnmp.Varbind(oid, ''))
-    session = netsnmp.Session(DestHost=host, Version=2, Community=community)
-    result = session.get(var)
+    prefetched = _PREFETCHED.get((host, community), {})
+    if oid in prefetched:
+        return prefetched[oid]
+
+    session = _get_session(host, community)
+    result = session.get(_varlist((oid,)))
     if result is None or result[0] is None:
-        print(f'UNKNOWN - SNMP GET failed for {oid}')
-        sys.exit(3)
+        raise SnmpError(f'UNKNOWN - SNMP GET failed for {oid}')
     return result[0]
 
 
-def snmp_walk(host, community, oid):
+def snmp_get_int(host, community, oid):
+    """Fetch a single INTEGER OID and return it as int."""
+    return int(snmp_get(host, community, oid))
+
+
+def snmp_get_many(host, community, oids, strict=True):
+    """Fetch several scalar OIDs in a single GET request.
+       Returns a dict with the same keys as the oids dict. When strict is
+       False a missing value returns None instead of raising SnmpError."""
+    prefetched = _PREFETCHED.get((host, community), {})
+    if all(oid in prefetched for oid in oids.values()):
+        return {k: prefetched[oid] for k, oid in oids.items()}
+
+    keys = list(oids)
+    session = _get_session(host, community)
+    result = session.get(_varlist(tuple(oids.values())))
+    if result is None or len(result) != len(keys):
+        if not strict:
+            return None
+        raise SnmpError(f"UNKNOWN - SNMP GET failed for {', '.join(oids.values())}")
+    for k, val in zip(keys, result):
+        if val is None:
+            if not strict:
+                return None
+            raise SnmpError(f'UNKNOWN - SNMP GET failed for {oids[k]}')
+    return dict(zip(keys, result))
+
+
+def snmp_prefetch(host, community, oids):
+    """Fetch a set of scalar OIDs in one GET so that later snmp_get and
+       snmp_get_many calls for them are answered without a request.
+       On failure nothing is stored and the checks fetch their own values."""
+    oids = list(dict.fromkeys(oids))
     try:
-        out = subprocess.check_output(
-            ['snmpwalk', '-v2c', '-c', community, host, oid],
-            universal_newlines=True
-        )
-        results = []
-        for line in out.strip().split('\n'):
-            if '=' in line:
-                val = line.split('=', 1)[1].strip()
-                if ':' in val:
-                    val = val.split(':', 1)[1].strip()
-                results.append(val)
-        return results
-    except Exception as e:  # noqa: B902
-        print(f'UNKNOWN - SNMP WALK failed for {oid}: {e}')
-        sys.exit(3)
+        vals = snmp_get_many(host, community, {oid: oid for oid in oids}, strict=False)
+    except SnmpError:
+        return
+    if vals is not None:
+        _PREFETCHED.setdefault((host, community), {}).update(vals)
+
+
+def _varbind_oid(vb):
+    oid = vb.tag.lstrip('.')
+    return f'{oid}.{vb.iid}' if vb.iid else oid
+
+
+def _oid_key(oid):
+    return tuple(int(x) for x in oid.split('.') if x)
+
+
+def snmp_bulkwalk(host, community, columns, max_repetitions=SNMP_MAX_REPETITIONS):
+    """Walk several table columns at once using GETBULK.
+       Returns {key: {index: value}} for each key of the columns dict."""
+    keys = list(columns)
+    results = {k: {} for k in keys}
+    cursors = dict(columns)
+    prefixes = {k: oid + '.' for k, oid in columns.items()}
+    session = _get_session(host, community)
+
+    while keys:
+        varlist = netsnmp.VarList(*[netsnmp.Varbind(cursors[k]) for k in keys])
+        try:
+            vals = session.getbulk(0, max_repetitions, varlist)
+        except Exception as e:  # noqa: B902
+            raise SnmpError(f'UNKNOWN - SNMP BULKWALK failed for {cursors[keys[0]]}: {e}') from e
+        if vals is None:
+            raise SnmpError(f'UNKNOWN - SNMP BULKWALK failed for {cursors[keys[0]]}')
+        # On an error status (tooBig, genErr) the request varbinds come back
+        if session.ErrorNum:
+            raise SnmpError(f'UNKNOWN - SNMP BULKWALK failed for {cursors[keys[0]]}: {session.ErrorStr}')  # noqa: E501
+        if len(varlist) == 0:
+            break
+
+        # Varbinds come back row by row, one per requested column
+        done = set()
+        advanced = False
+        for i, vb in enumerate(varlist):
+            key = keys[i % len(keys)]
+            if key in done:
+                continue
+            oid = _varbind_oid(vb)
+            prefix = prefixes[key]
+            if (vb.val is None or vb.type in SNMP_END_TYPES or not oid.startswith(prefix)
+                    or _oid_key(oid) <= _oid_key(cursors[key])):
+                done.add(key)
+                continue
+            results[key][oid[len(prefix):]] = _decode(vb.val)
+            cursors[key] = oid
+            advanced = True
+        keys = [k for k in keys if k not in done]
+
+        # Guard against an agent that answers without moving any column on
+        if not advanced and not done:
+            break
+
+    return results
+
+
+#
+# --- CACHE HELPERS ---
+#
+
+# Near-static table columns are kept on disk between runs, one file per host
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'check_white_rabbit')
+
+
+def _cache_path(host):
+    return os.path.join(CACHE_DIR, f'{host}.pickle')
+
+
+def cache_load(host):
+    """Return the cached {oid: (timestamp, values)} dict for a host."""
+    try:
+        with open(_cache_path(host), 'rb') as f:
+            cache = pickle.load(f)
+    except Exception:  # noqa: B902
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def cache_save(host, cache):
+    path = _cache_path(host)
+    tmp = f'{path}.{os.getpid()}'
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump(cache, f)
+        os.replace(tmp, path)
+    except OSError:
+        # A read-only home only costs us the cache, never the check
+        pass
+
+
+def cache_lookup(cache, oid):
+    """Return cached values for oid if still within its TTL, else None."""
+    entry = cache.get(oid)
+    # Anything but a (timestamp, dict) pair is treated as a miss
+    if (not isinstance(entry, tuple) or len(entry) != 2
+            or not isinstance(entry[0], (int, float)) or not isinstance(entry[1], dict)):
+        return None
+    ttl = WALK_CACHE_TTL.get(oid, 0)
+    if time.time() - entry[0] >= ttl:
+        return None
+    return entry[1]
+
 
 #
 # --- FORMAT HELPERS ---
@@ -70,18 +275,19 @@ def snmp_walk(host, community, oid):
 def format_octetstring(raw):
     """Convert raw SNMP OctetString into colon-separated hex string.
        Also strip FF:FE if it's an embedded EUI-64 from a MAC."""
-    if isinstance(raw, bytes):
-        hexs = [f'{b:02X}' for b in raw]
-    elif isinstance(raw, str):
-        hexs = [f'{ord(c):02X}' for c in raw]
-    else:
+    if isinstance(raw, str):
+        try:
+            raw = raw.encode('latin-1', errors='surrogateescape')
+        except UnicodeEncodeError:
+            return raw
+    elif not isinstance(raw, bytes):
         return str(raw)
 
     # Collapse EUI-64 with FF:FE in the middle back to 6-byte MAC
-    if len(hexs) == 8 and hexs[3:5] == ['FF', 'FE']:
-        hexs = hexs[0:3] + hexs[5:]
+    if len(raw) == 8 and raw[3:5] == b'\xff\xfe':
+        raw = raw[:3] + raw[5:]
 
-    return ':'.join(hexs)
+    return raw.hex(':').upper()
 
 
 #
@@ -174,11 +380,58 @@ PORT_TABLE_OIDS = {
     'txPower': '1.3.6.1.4.1.96.100.7.6.1.20',
     'rxPower': '1.3.6.1.4.1.96.100.7.6.1.21',
 }
+SFP_COLUMNS = ('name', 'sfpError', 'vendor', 'link', 'temp', 'txPower', 'rxPower')
+SFP_STATIC_COLUMNS = ('name',)
+SFP_VALUE_COLUMNS = ('sfpError', 'link', 'temp', 'txPower', 'rxPower')
+# SFPs are hot-pluggable, so the vendor is read live with the values
+SFP_LIVE_COLUMNS = ('vendor',) + SFP_VALUE_COLUMNS
+# Ports per GET of the live columns (6 varbinds each); keeps replies below tooBig
+SFP_PORTS_PER_GET = 10
+SFP_PERF_TEMPLATE = '{n}_temp={t} {n}_txPower={x} {n}_rxPower={r}'
+
+# Walk cache lifetime in seconds per column OID, uncached when not listed
+WALK_CACHE_TTL = {
+    PORT_TABLE_OIDS['name']: 3600,
+}
 
 ENDPOINT_STATUS_OID = '1.3.6.1.4.1.96.100.6.2.3.2.0'
 SWCORE_STATUS_OID = '1.3.6.1.4.1.96.100.6.2.3.3.0'
 RTU_STATUS_OID = '1.3.6.1.4.1.96.100.6.2.3.4.0'
 
+# Scalar OIDs fetched together by each mode, merged once at import
+CPU_OIDS = {'status': CPU_STATUS_OID, **CPU_NUMERIC_OIDS}
+TEMP_OIDS = {
+    'status': TEMP_STATUS_OID,
+    **{('temp', k): oid for k, oid in TEMP_VALUE_OIDS.items()},
+    **{('thresh', k): oid for k, oid in TEMP_THRESH_OIDS.items()},
+}
+MEM_OIDS = {'status': MEM_STATUS_OID, **MEM_VALUE_OIDS}
+PTP_OIDS = {'status': PTP_STATUS_OID, **PTP_IDS_OIDS, **PTP_PERF_OIDS}
+GENERIC_STATUS_OIDS = {
+    'os': OS_STATUS_OID,
+    'main': MAIN_STATUS_OID,
+    'timing': TIMING_STATUS_OID,
+    'net': NET_STATUS_OID
+}
+
+# Every scalar OID a mode reads, so several modes can share one GET
+MODE_OIDS = {
+    'cpu': list(CPU_OIDS.values()),
+    **{mode: [oid] for mode, oid in GENERIC_STATUS_OIDS.items()},
+    'temp': list(TEMP_OIDS.values()),
+    'mem': list(MEM_OIDS.values()),
+    'disk': [DISK_STATUS_OID],
+    'ptp': list(PTP_OIDS.values()),
+    'pll': [PLL_STATUS_OID],
+    'slave': [SLAVE_STATUS_OID],
+    'ptpframes': [PTPFRAMES_STATUS_OID],
+    'systemclock': [SYSTEMCLOCK_STATUS_OID],
+    'sfp': [SFP_STATUS_OID],
+    'endpoint': [ENDPOINT_STATUS_OID],
+    'swcore': [SWCORE_STATUS_OID],
+    'rtu': [RTU_STATUS_OID],
+}
+
 SFP_STATUS_MAP = {
     0: 'N/A',
     1: 'OK',
@@ -204,6 +457,11 @@ LINK_MAP = {
 #
 # --- STATUS MAPS ---
 #
+STATUS_NAMES = ['OK', 'WARNING', 'CRITICAL', 'UNKNOWN']
+
+# Exit codes from least to most severe, used to combine several checks
+SEVERITY = [0, 3, 1, 2]
+
 GENERIC_STATUS_MAP = {
     1: (0, 'OK'),
     2: (2, 'CRITICAL'),
@@ -292,51 +550,208 @@ RTU_STATUS_MAP = {
     6: (1, 'WARNING: First read')
 }
 
+#
+# --- CHECKS ---
+#
+# Every check returns (exit code, plugin output line)
+#
+
+
+def check_cpu(host, community):
+    vals = snmp_get_many(host, community, CPU_OIDS)
+    status_val = int(vals['status'])
+    exit_code = {1: 0, 2: 2, 3: 1}.get(status_val, 3)
+    status_str = STATUS_NAMES[exit_code]
+
+    numeric_vals = {k: float(vals[k]) for k in CPU_NUMERIC_OIDS}
+    perfdata = ' '.join([f'{k}={v}' for k, v in numeric_vals.items()])
+
+    return exit_code, f"{status_str}: CPU Load {numeric_vals['cpu1']}/{numeric_vals['cpu5']}/{numeric_vals['cpu15']} | {perfdata}"  # noqa: E501
+
+
+def check_generic(host, community, mode):
+    """OS / MAIN / TIMING / NET status."""
+    val = snmp_get_int(host, community, GENERIC_STATUS_OIDS[mode])
+    code, msg = GENERIC_STATUS_MAP[val] if val in GENERIC_STATUS_MAP else (3, f'UNKNOWN: {val}')
+    return code, f'{msg}: {mode.upper()} status'
+
+
+def check_temp(host, community):
+    vals = snmp_get_many(host, community, TEMP_OIDS)
+    status_val = int(vals['status'])
+    code, msg = TEMP_STATUS_MAP[status_val] if status_val in TEMP_STATUS_MAP else (3, f'UNKNOWN Temp status {status_val}')  # noqa: E501
+
+    temps = {k: int(vals[('temp', k)]) for k in TEMP_VALUE_OIDS}
+    thresholds = {k: int(vals[('thresh', k)]) for k in TEMP_THRESH_OIDS}
+
+    problems = [k for k in temps if temps[k] > thresholds[k]]
+    if problems:
+        msg = f"'CRITICAL: Overheating in {','.join(problems)}"
+        code = 2
+
+    perf = ' '.join([f'{k}={temps[k]};{thresholds[k]};{thresholds[k]};0;' for k in temps])
+    return code, f'{msg} | {perf}'
+
+
+def check_mem(host, community):
+    vals = snmp_get_many(host, community, MEM_OIDS)
+    status_val = int(vals['status'])
+    code, msg = MEM_STATUS_MAP[status_val] if status_val in MEM_STATUS_MAP else (3, f'UNKNOWN Memory status {status_val}')  # noqa: E501
+
+    memvals = {k: int(vals[k]) for k in MEM_VALUE_OIDS}
+    perf = ' '.join([f'{k}={v}' for k, v in memvals.items()])
+
+    return code, f"{msg}: Used {memvals['used']} / {memvals['total']} ({memvals['usedPerc']}%) | {perf}"  # noqa: E501
+
+
+def check_disk(host, community):
+    status_val = snmp_get_int(host, community, DISK_STATUS_OID)
+    code, msg = DISK_STATUS_MAP[status_val] if status_val in DISK_STATUS_MAP else (3, f'UNKNOWN Disk status {status_val}')  # noqa: E501
+
+    # size, free, usePct and fs are available in DISK_TABLE as well
+    table = snmp_bulkwalk(host, community, {k: DISK_TABLE[k] for k in ('mount', 'used')})
+    mounts = list(table['mount'].values())
+    used = [int(table['used'].get(idx, 0)) for idx in table['mount']]
+    perf = ' '.join([f'{mount}_used={u}' for mount, u in zip(mounts, used)])
+
+    return code, f"{msg}: Mounts {', '.join(mounts)} | {perf}"
+
+
+def check_ptp(host, community):
+    vals = snmp_get_many(host, community, PTP_OIDS)
+    status_val = int(vals['status'])
+    code, msg = PTP_STATUS_MAP[status_val] if status_val in PTP_STATUS_MAP else (3, f'UNKNOWN PTP status {status_val}')  # noqa: E501
+
+    ptp_ids = {k: vals[k] for k in PTP_IDS_OIDS}
+    gm = format_octetstring(ptp_ids['grandmaster'])
+
+    perfvals = {k: vals[k] for k in PTP_PERF_OIDS}
+    perf = ' '.join([f'{k}={v}' for k, v in perfvals.items()])
+
+    return code, f"{msg}: Port={ptp_ids['port']}, GM={gm}, Servo={ptp_ids['servoState']} | {perf}"  # noqa: E501
+
+
+def check_ptpframes(host, community):
+    # Simplified: Using PTP status map
+    status_val = snmp_get_int(host, community, PTPFRAMES_STATUS_OID)
+    code, msg = PTP_STATUS_MAP[status_val] if status_val in PTP_STATUS_MAP else (3, f'UNKNOWN PTP Frames status {status_val}')  # noqa: E501
+    return code, f'{msg}: PTP Frames status'
+
+
+def check_pll(host, community):
+    status_val = snmp_get_int(host, community, PLL_STATUS_OID)
+    code, msg = PLL_STATUS_MAP[status_val] if status_val in PLL_STATUS_MAP else (3, f'UNKNOWN PLL status {status_val}')  # noqa: E501
+    return code, f'{msg}: PLL status'
+
+
+def check_slave(host, community):
+    val = snmp_get_int(host, community, SLAVE_STATUS_OID)
+    code, msg = SLAVE_STATUS_MAP[val] if val in SLAVE_STATUS_MAP else (3, f'UNKNOWN slave status {val}')  # noqa: E501
+    return code, f'{msg}: Slave link status'
+
+
+def check_systemclock(host, community):
+    val = snmp_get_int(host, community, SYSTEMCLOCK_STATUS_OID)
+    code, msg = SYSTEMCLOCK_STATUS_MAP[val] if val in SYSTEMCLOCK_STATUS_MAP else (3, f'UNKNOWN system clock status {val}')  # noqa: E501
+    return code, f'{msg}: System clock status'
+
+
+def check_endpoint(host, community):
+    val = snmp_get_int(host, community, ENDPOINT_STATUS_OID)
+    code, msg = ENDPOINT_STATUS_MAP[val] if val in ENDPOINT_STATUS_MAP else (3, f'UNKNOWN endpoint status {val}')  # noqa: E501
+    return code, f'{msg}: Endpoint status'
+
+
+def check_swcore(host, community):
+    val = snmp_get_int(host, community, SWCORE_STATUS_OID)
+    code, msg = SWCORE_STATUS_MAP[val] if val in SWCORE_STATUS_MAP else (3, f'UNKNOWN Soft Core status {val}')  # noqa: E501
+    return code, f'{msg}: Soft Core status'
+
+
+def check_rtu(host, community):
+    val = snmp_get_int(host, community, RTU_STATUS_OID)
+    code, msg = RTU_STATUS_MAP[val] if val in RTU_STATUS_MAP else (3, f'UNKNOWN RTU status {val}')
+    return code, f'{msg}: RTU status'
+
+
 #
 # --- SFP CHECK ---
 #
 
 
+def _sfp_table(host, community):
+    """Return the PORT_TABLE columns used by check_sfp.
+       Port names come from the walk cache when fresh, so only the live
+       columns of the known ports need a GET. Falls back to a full walk
+       when the cache is stale or no longer matches the switch."""
+    cache = cache_load(host)
+    static = {k: cache_lookup(cache, PORT_TABLE_OIDS[k]) for k in SFP_STATIC_COLUMNS}
+
+    if None not in static.values():
+        ports = list(static['name'])
+        vals = _sfp_values(host, community, ports)
+        if vals is not None:
+            table = dict(static)
+            for k in SFP_LIVE_COLUMNS:
+                table[k] = {idx: _decode(vals[(k, idx)]) for idx in ports}
+            return table
+
+        # The cached ports no longer answer, walk now and again next run
+        for k in SFP_STATIC_COLUMNS:
+            del cache[PORT_TABLE_OIDS[k]]
+        cache_save(host, cache)
+        return snmp_bulkwalk(host, community, {k: PORT_TABLE_OIDS[k] for k in SFP_COLUMNS})
+
+    columns = {k: PORT_TABLE_OIDS[k] for k in SFP_COLUMNS}
+    table = snmp_bulkwalk(host, community, columns)
+    now = time.time()
+    for k in SFP_STATIC_COLUMNS:
+        cache[PORT_TABLE_OIDS[k]] = (now, table[k])
+    cache_save(host, cache)
+    return table
+
+
+def _sfp_values(host, community, ports):
+    """GET the SFP_LIVE_COLUMNS of the given ports, SFP_PORTS_PER_GET
+       ports per request. Returns None if any request fails."""
+    vals = {}
+    for i in range(0, len(ports), SFP_PORTS_PER_GET):
+        oids = {(k, idx): f'{PORT_TABLE_OIDS[k]}.{idx}'
+                for idx in ports[i:i + SFP_PORTS_PER_GET] for k in SFP_LIVE_COLUMNS}
+        batch = snmp_get_many(host, community, oids, strict=False)
+        if batch is None:
+            return None
+        vals.update(batch)
+    return vals
+
+
 def check_sfp(host, community):
-    status_val = int(snmp_get(host, community, SFP_STATUS_OID))
-    status_str = SFP_STATUS_MAP.get(status_val, f'Unknown({status_val})')
+    status_val = snmp_get_int(host, community, SFP_STATUS_OID)
+    status_str = SFP_STATUS_MAP[status_val] if status_val in SFP_STATUS_MAP else f'Unknown({status_val})'  # noqa: E501
 
-    port_names = snmp_walk(host, community, PORT_TABLE_OIDS['name'])
-    port_errors = snmp_walk(host, community, PORT_TABLE_OIDS['sfpError'])
-    port_vendor = snmp_walk(host, community, PORT_TABLE_OIDS['vendor'])
-    port_links = snmp_walk(host, community, PORT_TABLE_OIDS['link'])
-    port_temps = snmp_walk(host, community, PORT_TABLE_OIDS['temp'])
-    port_txpwrs = snmp_walk(host, community, PORT_TABLE_OIDS['txPower'])
-    port_rxpwrs = snmp_walk(host, community, PORT_TABLE_OIDS['rxPower'])
+    table = _sfp_table(host, community)
 
     problems = []
     perfdata = []
 
-    for i, pname in enumerate(port_names):
-        # Skip if SFPVN (Vendor Name) is empty
-        vendor_val = port_vendor[i] if i < len(port_vendor) else ''
-        if not vendor_val.strip().strip('"'):
-            continue
+    # Skip ports where SFPVN (Vendor Name) is empty
+    ports = list(table['name'])
+    mask = [bool(table['vendor'].get(idx, '').strip().strip('"')) for idx in ports]
+    ports = list(compress(ports, mask))
 
-        name = pname.decode() if isinstance(pname, bytes) else pname
-        err = int(port_errors[i]) if i < len(port_errors) else 0
-        link = int(port_links[i]) if i < len(port_links) else 0
-        temp = int(port_temps[i]) if i < len(port_temps) else 0
-        txp = int(port_txpwrs[i]) if i < len(port_txpwrs) else 0
-        rxp = int(port_rxpwrs[i]) if i < len(port_rxpwrs) else 0
+    names = [table['name'][idx] for idx in ports]
+    values = [[int(table[k].get(idx, 0)) for idx in ports] for k in SFP_VALUE_COLUMNS]
 
+    for name, err, link, temp, txp, rxp in zip(names, *values):
         if err != 1 or link != 2:
-            err_str = SFP_ERROR_MAP.get(err, f'Unknown({err})')
-            link_str = LINK_MAP.get(link, f'Unknown({link})')
+            err_str = SFP_ERROR_MAP[err] if err in SFP_ERROR_MAP else f'Unknown({err})'
+            link_str = LINK_MAP[link] if link in LINK_MAP else f'Unknown({link})'
             problems.append(f'{name}: {err_str}, link={link_str}')
 
-        perfdata.append(f'{name}_temp={temp}')
-        perfdata.append(f'{name}_txPower={txp}')
-        perfdata.append(f'{name}_rxPower={rxp}')
+        perfdata.append(SFP_PERF_TEMPLATE.format(n=name, t=temp, x=txp, r=rxp))
 
     if status_val == 1 and not problems:
-        print('OK: All SFPs OK | ' + ' '.join(perfdata))
-        sys.exit(0)
+        return 0, 'OK: All SFPs OK | ' + ' '.join(perfdata)
 
     if problems:
         msg = f'{status_str}: ' + '; '.join(problems)
@@ -344,168 +759,97 @@ def check_sfp(host, community):
         msg = f'{status_str}: No detailed problems found'
 
     exitcode = 2 if status_val == 2 else 1
-    print(msg + ' | ' + ' '.join(perfdata))
-    sys.exit(exitcode)
+    return exitcode, msg + ' | ' + ' '.join(perfdata)
 
 #
 # --- MAIN ---
 #
 
 
+MODE_HANDLERS = {
+    'cpu': check_cpu,
+    'os': partial(check_generic, mode='os'),
+    'main': partial(check_generic, mode='main'),
+    'timing': partial(check_generic, mode='timing'),
+    'net': partial(check_generic, mode='net'),
+    'temp': check_temp,
+    'mem': check_mem,
+    'disk': check_disk,
+    'ptp': check_ptp,
+    'pll': check_pll,
+    'slave': check_slave,
+    'ptpframes': check_ptpframes,
+    'systemclock': check_systemclock,
+    'sfp': check_sfp,
+    'endpoint': check_endpoint,
+    'swcore': check_swcore,
+    'rtu': check_rtu,
+}
+MODES = frozenset(MODE_HANDLERS)
+
+
+def run_modes(host, community, modes):
+    """Run several checks in one process, sharing the SNMP session.
+       The scalar OIDs of all modes are fetched up front in a single GET.
+       Returns the worst exit code and a single combined output line,
+       with each check's text and perfdata prefixed by its mode."""
+    snmp_prefetch(host, community, [oid for mode in modes for oid in MODE_OIDS[mode]])
+
+    texts = []
+    perfdata = []
+    codes = []
+    for mode in modes:
+        # A failed request only costs its own check, not the whole run
+        try:
+            code, output = MODE_HANDLERS[mode](host, community)
+        except SnmpError as e:
+            code, output = 3, str(e)
+        text, _, perf = output.partition(' | ')
+        codes.append(code)
+        texts.append(f'{mode}: {text}')
+        perfdata.extend(f'{mode}_{p}' for p in perf.split())
+
+    code = max(codes, key=SEVERITY.index)
+    output = f'{STATUS_NAMES[code]}: ' + '; '.join(texts)
+    if perfdata:
+        output += ' | ' + ' '.join(perfdata)
+    return code, output
+
+
 def main():
 
     parser = argparse.ArgumentParser(description='Nagios plugin for White Rabbit switch')
     parser.add_argument('-H', '--host', required=True, help='Hostname or IP')
     parser.add_argument('-C', '--community', default='public', help='SNMP community string')
-    parser.add_argument('-m', '--mode', required=True, choices=[
-        'cpu', 'os', 'main', 'timing', 'net', 'temp', 'mem', 'disk',
-        'ptp', 'pll', 'slave', 'ptpframes', 'systemclock', 'sfp',
-        'endpoint', 'swcore', 'rtu'
-    ], help='Metric to monitor')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('-m', '--mode', metavar='MODE',
+                       help=f"Metric to monitor: {', '.join(MODE_HANDLERS)}")
+    group.add_argument('--modes', help='Comma separated list of metrics to monitor in one run')
+    group.add_argument('--all', action='store_true', help='Monitor every metric in one run')
     args = parser.parse_args()
 
-    # CPU
-    if args.mode == 'cpu':
-        status_val = int(snmp_get(args.host, args.community, CPU_STATUS_OID))
-        exit_code = {1: 0, 2: 2, 3: 1}.get(status_val, 3)
-        status_str = ['OK', 'WARNING', 'CRITICAL', 'UNKNOWN'][exit_code]
-
-        numeric_vals = {k: float(snmp_get(args.host, args.community, oid)) for k, oid in CPU_NUMERIC_OIDS.items()}  # noqa: E501
-        perfdata = ' '.join([f'{k}={v}' for k, v in numeric_vals.items()])
-
-        print(f"{status_str}: CPU Load {numeric_vals['cpu1']}/{numeric_vals['cpu5']}/{numeric_vals['cpu15']} | {perfdata}")  # noqa: E501
-        sys.exit(exit_code)
-
-    # OS / MAIN / TIMING / NET
-    if args.mode in ['os', 'main', 'timing', 'net']:
-        oid = {
-            'os': OS_STATUS_OID,
-            'main': MAIN_STATUS_OID,
-            'timing': TIMING_STATUS_OID,
-            'net': NET_STATUS_OID
-        }[args.mode]
-        val = int(snmp_get(args.host, args.community, oid))
-        code, msg = GENERIC_STATUS_MAP.get(val, (3, f'UNKNOWN: {val}'))
-        print(f'{msg}: {args.mode.upper()} status')
-        sys.exit(code)
-
-    # TEMP
-    if args.mode == 'temp':
-        status_val = int(snmp_get(args.host, args.community, TEMP_STATUS_OID))
-        code, msg = TEMP_STATUS_MAP.get(status_val, (3, f'UNKNOWN Temp status {status_val}'))
-
-        temps = {k: int(snmp_get(args.host, args.community, oid)) for k, oid in TEMP_VALUE_OIDS.items()}  # noqa: E501
-        thresholds = {k: int(snmp_get(args.host, args.community, oid)) for k, oid in TEMP_THRESH_OIDS.items()}  # noqa: E501
-
-        problems = [k for k in temps if temps[k] > thresholds[k]]
-        if problems:
-            msg = f"'CRITICAL: Overheating in {','.join(problems)}"
-            code = 2
-
-        perf = ' '.join([f'{k}={temps[k]};{thresholds[k]};{thresholds[k]};0;' for k in temps])
-        print(f'{msg} | {perf}')
-        sys.exit(code)
-
-    # MEM
-    if args.mode == 'mem':
-        status_val = int(snmp_get(args.host, args.community, MEM_STATUS_OID))
-        code, msg = MEM_STATUS_MAP.get(status_val, (3, f'UNKNOWN Memory status {status_val}'))
-
-        memvals = {k: int(snmp_get(args.host, args.community, oid)) for k, oid in MEM_VALUE_OIDS.items()}  # noqa: E501
-        perf = ' '.join([f'{k}={v}' for k, v in memvals.items()])
-
-        print(f"{msg}: Used {memvals['used']} / {memvals['total']} ({memvals['usedPerc']}%) | {perf}")  # noqa: E501
-        sys.exit(code)
-
-    # DISK
-    if args.mode == 'disk':
-        status_val = int(snmp_get(args.host, args.community, DISK_STATUS_OID))
-        code, msg = DISK_STATUS_MAP.get(status_val, (3, f'UNKNOWN Disk status {status_val}'))
-
-        mounts = snmp_walk(args.host, args.community, DISK_TABLE['mount'])
-        # sizes = [int(x) for x in snmp_walk(args.host, args.community, DISK_TABLE['size'])]
-        used = [int(x) for x in snmp_walk(args.host, args.community, DISK_TABLE['used'])]
-        # free = [int(x) for x in snmp_walk(args.host, args.community, DISK_TABLE['free'])]
-        # usePct = [int(x) for x in snmp_walk(args.host, args.community, DISK_TABLE['usePct'])]
-        perf = ' '.join([f'{mount}_used={u}' for mount, u in zip(mounts, used)])
-
-        print(f"{msg}: Mounts {', '.join(mounts)} | {perf}")
-        sys.exit(code)
-
-    # PTP
-    if args.mode == 'ptp':
-        status_val = int(snmp_get(args.host, args.community, PTP_STATUS_OID))
-        code, msg = PTP_STATUS_MAP.get(status_val, (3, f'UNKNOWN PTP status {status_val}'))
-
-        ptp_ids = {k: snmp_get(args.host, args.community, oid) for k, oid in PTP_IDS_OIDS.items()}
-        gm = format_octetstring(ptp_ids['grandmaster'])
-
-        perfvals = {k: snmp_get(args.host, args.community, oid) for k, oid in PTP_PERF_OIDS.items()}
-        perf = ' '.join([f'{k}={v}' for k, v in perfvals.items()])
-
-        print(f"{msg}: Port={ptp_ids['port']}, GM={gm}, Servo={ptp_ids['servoState']} | {perf}")
-        sys.exit(code)
-
-    # PTP Frames
-    if args.mode == 'ptpframes':
-        # Simplified: Using PTP status map
-        status_val = int(snmp_get(args.host, args.community, PTPFRAMES_STATUS_OID))
-        code, msg = PTP_STATUS_MAP.get(status_val, (3, f'UNKNOWN PTP Frames status {status_val}'))
-        print(f'{msg}: PTP Frames status')
-        sys.exit(code)
-
-    # PLL
-    if args.mode == 'pll':
-        status_val = int(snmp_get(args.host, args.community, PLL_STATUS_OID))
-        code, msg = PLL_STATUS_MAP.get(status_val, (3, f'UNKNOWN PLL status {status_val}'))
-        print(f'{msg}: PLL status')
-        sys.exit(code)
-
-    # SLAVE
-    if args.mode == 'slave':
-        val = int(snmp_get(args.host, args.community, SLAVE_STATUS_OID))
-        code, msg = SLAVE_STATUS_MAP.get(val, (3, f'UNKNOWN slave status {val}'))
-        print(f'{msg}: Slave link status')
-        sys.exit(code)
-
-    # PTP FRAMES
-    if args.mode == 'ptpframes':
-        val = int(snmp_get(args.host, args.community, PTPFRAMES_STATUS_OID))
-        code, msg = PTPFRAMES_STATUS_MAP.get(val, (3, f'UNKNOWN PTP frames status {val}'))
-        print(f'{msg}: PTP frames flowing')
-        sys.exit(code)
-
-    # SYSTEM CLOCK
-    if args.mode == 'systemclock':
-        val = int(snmp_get(args.host, args.community, SYSTEMCLOCK_STATUS_OID))
-        code, msg = SYSTEMCLOCK_STATUS_MAP.get(val, (3, f'UNKNOWN system clock status {val}'))
-        print(f'{msg}: System clock status')
-        sys.exit(code)
-
-    # --- SFP ---
-    if args.mode == 'sfp':
-        check_sfp(args.host, args.community)
-
-    # ENDPOINT STATUS
-    if args.mode == 'endpoint':
-        val = int(snmp_get(args.host, args.community, ENDPOINT_STATUS_OID))
-        code, msg = ENDPOINT_STATUS_MAP.get(val, (3, f'UNKNOWN endpoint status {val}'))
-        print(f'{msg}: Endpoint status')
-        sys.exit(code)
-
-    # SWCORE STATUS
-    if args.mode == 'swcore':
-        val = int(snmp_get(args.host, args.community, SWCORE_STATUS_OID))
-        code, msg = SWCORE_STATUS_MAP.get(val, (3, f'UNKNOWN Soft Core status {val}'))
-        print(f'{msg}: Soft Core status')
-        sys.exit(code)
-
-    # RTU STATUS
-    if args.mode == 'rtu':
-        val = int(snmp_get(args.host, args.community, RTU_STATUS_OID))
-        code, msg = RTU_STATUS_MAP.get(val, (3, f'UNKNOWN RTU status {val}'))
-        print(f'{msg}: RTU status')
-        sys.exit(code)
+    # Validated here rather than with choices= so the error lists the
+    # modes in MODE_HANDLERS order instead of frozenset order
+    def invalid_choice(option, value):
+        parser.error(f"argument {option}: invalid choice: {value!r} (choose from {', '.join(MODE_HANDLERS)})")  # noqa: E501
+
+    if args.all:
+        code, output = run_modes(args.host, args.community, list(MODE_HANDLERS))
+    elif args.modes is not None:
+        modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+        unknown = [m for m in modes if m not in MODES]
+        if not modes or unknown:
+            invalid_choice('--modes', ', '.join(unknown) or args.modes)
+        code, output = run_modes(args.host, args.community, modes)
+    else:
+        if args.mode not in MODES:
+            invalid_choice('-m/--mode', args.mode)
+        try:
+            code, output = MODE_HANDLERS[args.mode](args.host, args.community)
+        except SnmpError as e:
+            code, output = 3, str(e)
+
+    _emit(code, output)
 
 
 if __name__ == '__main__':
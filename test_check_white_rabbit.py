@@ -12,10 +12,89 @@ def mock_snmp_get(mapping):
     return fake_get
 
 
-def mock_snmp_walk(values):
-    def fake_walk(host, community, oid):
-        return values.get(oid, [])
-    return fake_walk
+def mock_snmp_get_many(mapping):
+    def fake_get_many(host, community, oids, strict=True):
+        return {k: mapping.get(oid, '0') for k, oid in oids.items()}
+    return fake_get_many
+
+
+def mock_snmp_bulkwalk(rows):
+    def fake_bulkwalk(host, community, columns):
+        return {k: {str(i): row[k] for i, row in enumerate(rows, 1) if k in row} for k in columns}  # noqa: E501
+    return fake_bulkwalk
+
+
+class FakeVarbind:
+    def __init__(self, tag=None, iid=None, val=None, type=None):
+        self.tag, self.iid, self.val, self.type = tag, iid, val, type
+
+
+class FakeVarList(list):
+    def __init__(self, *varbinds):
+        super().__init__(varbinds)
+
+
+class FakeSession:
+    """Answers GET and GETBULK from an {oid: value} dict like an agent.
+       max_varbinds cuts GETBULK replies short, max_get makes larger GETs
+       fail the way a tooBig reply does and bulk_error answers GETBULK with
+       that error status."""
+
+    def __init__(self, agent, max_varbinds=None, max_get=None, bulk_error=None):
+        self.agent = agent
+        self.bulk_error = bulk_error
+        self.ErrorNum = 0
+        self.ErrorStr = ''
+        self.oids = sorted(agent, key=wr._oid_key)
+        self.max_varbinds = max_varbinds
+        self.max_get = max_get
+        self.calls = []
+
+    def _next(self, oid):
+        for o in self.oids:
+            if wr._oid_key(o) > wr._oid_key(oid):
+                return o
+        return None
+
+    def get(self, varlist):
+        self.calls.append(('get', len(varlist)))
+        if self.max_get is not None and len(varlist) > self.max_get:
+            return None
+        for vb in varlist:
+            vb.val = self.agent.get(vb.tag)
+            vb.type = None if vb.val is not None else 'NOSUCHOBJECT'
+        return tuple(vb.val for vb in varlist)
+
+    def getbulk(self, nonrepeaters, maxrepetitions, varlist):
+        self.calls.append(('getbulk', len(varlist)))
+        if self.bulk_error:
+            # The binding hands back the request varbinds with the error
+            self.ErrorNum, self.ErrorStr = 1, self.bulk_error
+            return tuple(vb.val for vb in varlist)
+        cursors = [vb.tag for vb in varlist]
+        out = []
+        for _ in range(maxrepetitions):
+            for i, cursor in enumerate(cursors):
+                oid = self._next(cursor)
+                if oid is None:
+                    # The binding leaves val set and only reports the type
+                    out.append(FakeVarbind('.' + cursor, '', '', 'ENDOFMIBVIEW'))
+                    continue
+                tag, _, iid = oid.rpartition('.')
+                out.append(FakeVarbind('.' + tag, iid, self.agent[oid], 'INTEGER'))
+                cursors[i] = oid
+        varlist[:] = out[:self.max_varbinds]
+        return tuple(None if vb.type == 'ENDOFMIBVIEW' else vb.val for vb in varlist)
+
+
+def fake_agent(monkeypatch, agent, **kwargs):
+    """Run the real SNMP helpers against a FakeSession."""
+    session = FakeSession(agent, **kwargs)
+    monkeypatch.setattr(wr, 'netsnmp', type('netsnmp', (), {
+        'VarList': FakeVarList, 'Varbind': FakeVarbind}))
+    monkeypatch.setattr(wr, '_VARLISTS', {})
+    monkeypatch.setattr(wr, '_get_session', lambda host, community: session)
+    return session
 
 
 def run_with_args(monkeypatch, args):
@@ -26,6 +105,25 @@ def run_with_args(monkeypatch, args):
     return e.value.code
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    """Keep the walk cache out of the home directory."""
+    monkeypatch.setattr(wr, 'CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def exit_raises(monkeypatch):
+    """_emit ends the process with os._exit, raise SystemExit instead."""
+    monkeypatch.setattr(wr.os, '_exit', sys.exit)
+
+
+@pytest.fixture(autouse=True)
+def no_prefetch(monkeypatch):
+    """Don't let values prefetched by one test answer the next."""
+    monkeypatch.setattr(wr, '_PREFETCHED', {})
+
+
 # --- Tests ---
 def test_cpu_ok(monkeypatch, capsys):
     mapping = {
@@ -34,7 +132,7 @@ def test_cpu_ok(monkeypatch, capsys):
         wr.CPU_NUMERIC_OIDS['cpu5']: '20',
         wr.CPU_NUMERIC_OIDS['cpu15']: '30',
     }
-    monkeypatch.setattr(wr, 'snmp_get', mock_snmp_get(mapping))
+    monkeypatch.setattr(wr, 'snmp_get_many', mock_snmp_get_many(mapping))
 
     code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'cpu'])
     assert code == 0
@@ -51,7 +149,7 @@ def test_mem_warning(monkeypatch, capsys):
         wr.MEM_VALUE_OIDS['usedPerc']: '60',
         wr.MEM_VALUE_OIDS['free']: '400',
     }
-    monkeypatch.setattr(wr, 'snmp_get', mock_snmp_get(mapping))
+    monkeypatch.setattr(wr, 'snmp_get_many', mock_snmp_get_many(mapping))
 
     code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'mem'])
     assert code == 1
@@ -64,20 +162,18 @@ def test_disk_ok(monkeypatch, capsys):
     mapping = {wr.DISK_STATUS_OID: '1'}  # OK
     monkeypatch.setattr(wr, 'snmp_get', mock_snmp_get(mapping))
 
-    walk = {
-        wr.DISK_TABLE['mount']: ['root'],
-        wr.DISK_TABLE['size']: ['100'],
-        wr.DISK_TABLE['used']: ['50'],
-        wr.DISK_TABLE['free']: ['50'],
-        wr.DISK_TABLE['usePct']: ['50'],
-    }
-    monkeypatch.setattr(wr, 'snmp_walk', mock_snmp_walk(walk))
+    rows = [
+        {'mount': 'root', 'size': '100', 'used': '50', 'free': '50', 'usePct': '50'},
+        {'mount': 'tmp', 'size': '10', 'used': '1', 'free': '9', 'usePct': '10'},
+    ]
+    monkeypatch.setattr(wr, 'snmp_bulkwalk', mock_snmp_bulkwalk(rows))
 
     code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'disk'])
     assert code == 0
     out = capsys.readouterr().out
     print(f'\n{out}')
     assert 'Disk' in out
+    assert 'root_used=50 tmp_used=1' in out
 
 
 @pytest.mark.parametrize('mode,oid,val,expected_code,expected_msg', [
@@ -109,7 +205,7 @@ def test_temp_overheat(monkeypatch, capsys):
         wr.TEMP_VALUE_OIDS['fpga']: '90',
         wr.TEMP_THRESH_OIDS['fpga']: '80',
     }
-    monkeypatch.setattr(wr, 'snmp_get', mock_snmp_get(mapping))
+    monkeypatch.setattr(wr, 'snmp_get_many', mock_snmp_get_many(mapping))
 
     code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'temp'])
     assert code == 2
@@ -120,7 +216,7 @@ def test_temp_overheat(monkeypatch, capsys):
 
 def test_ptp_ok(monkeypatch, capsys):
     mapping = {wr.PTP_STATUS_OID: '1'}  # OK
-    monkeypatch.setattr(wr, 'snmp_get', mock_snmp_get(mapping))
+    monkeypatch.setattr(wr, 'snmp_get_many', mock_snmp_get_many(mapping))
 
     code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'ptp'])
     assert code == 0
@@ -144,21 +240,8 @@ def test_sfp_with_problem(monkeypatch, capsys):
     mapping = {wr.SFP_STATUS_OID: '2'}  # ERROR
     monkeypatch.setattr(wr, 'snmp_get', mock_snmp_get(mapping))
 
-    if not hasattr(wr, 'SFP_TABLE'):
-        wr.SFP_TABLE = {
-            'port': '1.3.6.1.4.1.96.100.7.6.1.2',
-            'vendor': '1.3.6.1.4.1.96.100.7.6.1.3',
-            'sn': '1.3.6.1.4.1.96.100.7.6.1.4',
-            'pn': '1.3.6.1.4.1.96.100.7.6.1.5',
-        }
-
-    walk = {
-        wr.SFP_TABLE['port']: ['wri1'],
-        wr.SFP_TABLE['vendor']: ['BlueOptics'],
-        wr.SFP_TABLE['sn']: ['12345'],
-        wr.SFP_TABLE['pn']: ['BO1234'],
-    }
-    monkeypatch.setattr(wr, 'snmp_walk', mock_snmp_walk(walk))
+    rows = [{'name': 'wri1', 'vendor': '', 'sfpError': '3', 'link': '1'}]
+    monkeypatch.setattr(wr, 'snmp_bulkwalk', mock_snmp_bulkwalk(rows))
 
     code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'sfp'])
     assert code == 2
@@ -167,6 +250,87 @@ def test_sfp_with_problem(monkeypatch, capsys):
     assert 'No detailed problems found' in out
 
 
+def test_sfp_port_down(monkeypatch, capsys):
+    mapping = {wr.SFP_STATUS_OID: '3'}  # WARNING
+    monkeypatch.setattr(wr, 'snmp_get', mock_snmp_get(mapping))
+
+    rows = [
+        {'name': 'wri1', 'vendor': 'BlueOptics', 'sfpError': '1', 'link': '2',
+         'temp': '40', 'txPower': '300', 'rxPower': '250'},
+        {'name': 'wri2', 'vendor': 'BlueOptics', 'sfpError': '3', 'link': '1',
+         'temp': '41', 'txPower': '0', 'rxPower': '0'},
+        {'name': 'wri3', 'vendor': '', 'sfpError': '0', 'link': '0'},
+    ]
+    monkeypatch.setattr(wr, 'snmp_bulkwalk', mock_snmp_bulkwalk(rows))
+
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'sfp'])
+    assert code == 1
+    out = capsys.readouterr().out
+    print(f'\n{out}')
+    assert 'wri2: portDown, link=down' in out
+    assert 'wri1_temp=40' in out
+    assert 'wri3' not in out
+
+
+def test_sfp_cached_ports(monkeypatch, capsys):
+    mapping = {
+        wr.SFP_STATUS_OID: '1',  # OK
+        wr.PORT_TABLE_OIDS['sfpError'] + '.1': '1',
+        wr.PORT_TABLE_OIDS['link'] + '.1': '2',
+        wr.PORT_TABLE_OIDS['temp'] + '.1': '42',
+        wr.PORT_TABLE_OIDS['vendor'] + '.1': 'BlueOptics',
+        wr.PORT_TABLE_OIDS['vendor'] + '.2': '',
+    }
+    monkeypatch.setattr(wr, 'snmp_get', mock_snmp_get(mapping))
+    monkeypatch.setattr(wr, 'snmp_get_many', mock_snmp_get_many(mapping))
+
+    rows = [{'name': 'wri1', 'vendor': 'BlueOptics', 'sfpError': '3', 'link': '1'},
+            {'name': 'wri2', 'vendor': ''}]
+    monkeypatch.setattr(wr, 'snmp_bulkwalk', mock_snmp_bulkwalk(rows))
+
+    # First run walks the table and fills the cache
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'sfp'])
+    assert code == 1
+    capsys.readouterr()
+
+    # Second run only GETs the live columns of the known ports
+    monkeypatch.setattr(wr, 'snmp_bulkwalk', None)
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'sfp'])
+    assert code == 0
+    out = capsys.readouterr().out
+    print(f'\n{out}')
+    assert 'wri1_temp=42' in out
+    assert 'wri2' not in out
+
+
+def test_sfp_cache_expired(monkeypatch, cache_dir):
+    oid = wr.PORT_TABLE_OIDS['name']
+    wr.cache_save('127.0.0.1', {oid: (0, {'1': 'wri1'})})
+    cache = wr.cache_load('127.0.0.1')
+    assert cache[oid][1] == {'1': 'wri1'}
+    assert wr.cache_lookup(cache, oid) is None
+
+
+@pytest.mark.parametrize('entry', [None, 'junk', (1,), ('now', {}), (1e12, ['wri1'])])
+def test_sfp_cache_malformed(monkeypatch, entry):
+    oid = wr.PORT_TABLE_OIDS['name']
+    wr.cache_save('127.0.0.1', {oid: entry})
+    assert wr.cache_lookup(wr.cache_load('127.0.0.1'), oid) is None
+
+
+@pytest.mark.parametrize('raw,expected', [
+    (b'\x64\xfb\x81\xff\xfe\x2f\x66\xc9', '64:FB:81:2F:66:C9'),  # EUI-64 from MAC
+    (b'\x64\xfb\x81\x00\x01\x2f\x66\xc9', '64:FB:81:00:01:2F:66:C9'),
+    ('\x64\xfb\x81\xff\xfe\x2f\x66\xc9', '64:FB:81:2F:66:C9'),
+    (b'', ''),
+    ('x\udcff', '78:FF'),  # surrogate escaped byte
+    ('wr\u0100', 'wr\u0100'),  # not representable as bytes
+    (42, '42'),
+])
+def test_format_octetstring(raw, expected):
+    assert wr.format_octetstring(raw) == expected
+
+
 @pytest.mark.parametrize('mode,oid', [
     ('endpoint', wr.ENDPOINT_STATUS_OID),
     ('swcore', wr.SWCORE_STATUS_OID),
@@ -214,3 +378,229 @@ def test_pll_error(monkeypatch, capsys):
     out = capsys.readouterr().out
     print(f'\n{out}')
     assert 'pll' in out.lower()
+
+
+def test_multiple_modes(monkeypatch, capsys):
+    mapping = {
+        wr.OS_STATUS_OID: '1',  # OK
+        wr.PLL_STATUS_OID: '2',  # ERROR
+        wr.MEM_STATUS_OID: '1',  # OK
+        wr.MEM_VALUE_OIDS['used']: '600',
+    }
+    monkeypatch.setattr(wr, 'snmp_get', mock_snmp_get(mapping))
+    monkeypatch.setattr(wr, 'snmp_get_many', mock_snmp_get_many(mapping))
+
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '--modes', 'os,pll,mem'])
+    assert code == 2
+    out = capsys.readouterr().out
+    print(f'\n{out}')
+    assert out.startswith('CRITICAL: os: OK: OS status; pll: CRITICAL: PLL status; mem: ')
+    assert 'mem_used=600' in out
+
+
+def test_multiple_modes_invalid(monkeypatch, capsys):
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '--modes', 'os,bogus'])
+    assert code == 2
+    assert 'bogus' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('value', ['', ' , '])
+def test_multiple_modes_empty(monkeypatch, capsys, value):
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '--modes', value])
+    assert code == 2
+    assert 'argument --modes: invalid choice' in capsys.readouterr().err
+
+
+def test_invalid_mode_lists_modes_in_order(monkeypatch, capsys):
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'bogus'])
+    assert code == 2
+    err = capsys.readouterr().err
+    assert "invalid choice: 'bogus'" in err
+    assert f"(choose from {', '.join(wr.MODE_HANDLERS)})" in err
+
+
+def switch_agent():
+    """A switch where every check reports OK."""
+    agent = {oid: '1' for oids in wr.MODE_OIDS.values() for oid in oids}
+    agent[wr.TEMP_STATUS_OID] = '2'  # Temperature normal
+    agent.update({f"{wr.DISK_TABLE['mount']}.1": '/', f"{wr.DISK_TABLE['used']}.1": '50'})
+    agent.update(port_table_agent(2))
+    return agent
+
+
+def test_all_modes(monkeypatch, capsys):
+    session = fake_agent(monkeypatch, switch_agent())
+
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '--all'])
+    out = capsys.readouterr().out
+    print(f'\n{out}')
+    assert code == 0
+    assert all(f'{mode}: ' in out for mode in wr.MODE_HANDLERS)
+
+    # One GET for every scalar, then only the disk and sfp table walks
+    scalars = len({oid for oids in wr.MODE_OIDS.values() for oid in oids})
+    assert session.calls == [('get', scalars), ('getbulk', 2), ('getbulk', 7)]
+
+
+def test_all_modes_prefetch_failed(monkeypatch, capsys):
+    # The agent rejects large GETs, so the prefetch fails
+    session = fake_agent(monkeypatch, switch_agent(), max_get=10)
+
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '--all'])
+    out = capsys.readouterr().out
+    print(f'\n{out}')
+    assert code == 0
+    assert all(f'{mode}: ' in out for mode in wr.MODE_HANDLERS)
+
+    # Each check then fetches its own values
+    gets = [n for call, n in session.calls if call == 'get']
+    assert gets[1:] == [len(wr.MODE_OIDS[mode]) for mode in wr.MODE_HANDLERS]
+
+
+def test_mode_oids_cover_all_modes():
+    assert set(wr.MODE_OIDS) == wr.MODES
+
+
+BULK_COLUMNS = {'a': '1.3.6.1.4.1.96.1', 'b': '1.3.6.1.4.1.96.2'}
+
+
+def test_bulkwalk_uneven_columns(monkeypatch):
+    agent = {f'1.3.6.1.4.1.96.1.{i}': f'a{i}' for i in range(1, 15)}
+    agent.update({f'1.3.6.1.4.1.96.2.{i}': f'b{i}' for i in range(1, 4)})
+    agent['1.3.6.1.4.1.96.3.1'] = 'next'  # leaves both subtrees
+    session = fake_agent(monkeypatch, agent)
+
+    table = wr.snmp_bulkwalk('127.0.0.1', 'public', BULK_COLUMNS)
+    assert table['a'] == {str(i): f'a{i}' for i in range(1, 15)}
+    assert table['b'] == {str(i): f'b{i}' for i in range(1, 4)}
+    # Column b is finished after the first reply, a continues on its own
+    assert session.calls == [('getbulk', 2), ('getbulk', 1)]
+
+
+def test_bulkwalk_short_reply(monkeypatch):
+    agent = {f'1.3.6.1.4.1.96.{c}.{i}': f'{c}.{i}' for c in (1, 2) for i in range(1, 6)}
+    agent['1.3.6.1.4.1.96.3.1'] = 'next'
+    fake_agent(monkeypatch, agent, max_varbinds=3)  # cut short mid row
+
+    table = wr.snmp_bulkwalk('127.0.0.1', 'public', BULK_COLUMNS)
+    assert table['a'] == {str(i): f'1.{i}' for i in range(1, 6)}
+    assert table['b'] == {str(i): f'2.{i}' for i in range(1, 6)}
+
+
+def test_bulkwalk_end_of_mib_view(monkeypatch):
+    # Nothing after column b, so the agent answers ENDOFMIBVIEW
+    agent = {f'1.3.6.1.4.1.96.{c}.{i}': f'{c}.{i}' for c in (1, 2) for i in range(1, 4)}
+    session = fake_agent(monkeypatch, agent)
+
+    table = wr.snmp_bulkwalk('127.0.0.1', 'public', BULK_COLUMNS)
+    assert table['b'] == {str(i): f'2.{i}' for i in range(1, 4)}
+    assert len(session.calls) == 1
+
+
+def test_bulkwalk_error_status(monkeypatch, capsys):
+    agent = {f'1.3.6.1.4.1.96.1.{i}': f'a{i}' for i in range(1, 4)}
+    agent[wr.DISK_STATUS_OID] = '1'
+    fake_agent(monkeypatch, agent, bulk_error='Response message would have been too large.')
+
+    with pytest.raises(wr.SnmpError, match='UNKNOWN - SNMP BULKWALK failed'):
+        wr.snmp_bulkwalk('127.0.0.1', 'public', BULK_COLUMNS)
+
+    # A single check reports the failure as UNKNOWN
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '-m', 'disk'])
+    assert code == 3
+    out = capsys.readouterr().out
+    assert out.startswith('UNKNOWN - SNMP BULKWALK failed')
+    assert 'too large' in out
+
+
+def port_table_agent(ports):
+    agent = {}
+    for i in range(1, ports + 1):
+        row = {'name': f'wri{i}', 'vendor': 'BlueOptics', 'link': '2'}  # sfpOk, link up
+        for k, oid in wr.PORT_TABLE_OIDS.items():
+            agent[f'{oid}.{i}'] = row.get(k, '1')
+    agent['1.3.6.1.4.1.96.100.7.7.1'] = '0'  # next table
+    return agent
+
+
+def test_sfp_cached_gets_are_batched(monkeypatch):
+    session = fake_agent(monkeypatch, port_table_agent(18))
+    wr._sfp_table('127.0.0.1', 'public')  # walk and fill the cache
+
+    session.calls.clear()
+    table = wr._sfp_table('127.0.0.1', 'public')
+    assert len(table['temp']) == 18
+    assert session.calls == [('get', 60), ('get', 48)]
+
+    # The batch size is independent of the GETBULK max repetitions
+    monkeypatch.setattr(wr, 'SFP_PORTS_PER_GET', 4)
+    session.calls.clear()
+    wr._sfp_table('127.0.0.1', 'public')
+    assert session.calls == [('get', 24)] * 4 + [('get', 12)]
+
+
+def test_sfp_hotplug_with_warm_cache(monkeypatch):
+    agent = port_table_agent(3)
+    agent[f"{wr.PORT_TABLE_OIDS['vendor']}.3"] = ''  # port 3 starts empty
+    fake_agent(monkeypatch, {wr.SFP_STATUS_OID: '1', **agent})
+    code, output = wr.check_sfp('127.0.0.1', 'public')  # fills the cache
+    assert code == 0
+    assert 'wri3' not in output
+
+    # Pull the SFP from port 2: it is skipped, not reported as portDown
+    agent[f"{wr.PORT_TABLE_OIDS['vendor']}.2"] = ''
+    agent[f"{wr.PORT_TABLE_OIDS['sfpError']}.2"] = '3'
+    agent[f"{wr.PORT_TABLE_OIDS['link']}.2"] = '1'
+    # Plug one into port 3: it is monitored straight away
+    agent[f"{wr.PORT_TABLE_OIDS['vendor']}.3"] = 'BlueOptics'
+    session = fake_agent(monkeypatch, {wr.SFP_STATUS_OID: '1', **agent})
+
+    code, output = wr.check_sfp('127.0.0.1', 'public')
+    assert code == 0
+    assert output.startswith('OK: All SFPs OK')
+    assert 'wri2' not in output
+    assert 'wri3_temp=1' in output
+    assert 'getbulk' not in [call for call, _ in session.calls]
+
+
+def test_sfp_cache_dropped_after_failed_get(monkeypatch):
+    session = fake_agent(monkeypatch, port_table_agent(4), max_get=10)
+    wr._sfp_table('127.0.0.1', 'public')  # walk and fill the cache
+
+    # The GET of the cached ports fails, so this run walks instead
+    session.calls.clear()
+    table = wr._sfp_table('127.0.0.1', 'public')
+    assert len(table['temp']) == 4
+    assert [c[0] for c in session.calls] == ['get', 'getbulk']
+    assert wr.PORT_TABLE_OIDS['name'] not in wr.cache_load('127.0.0.1')
+
+    # ... and the next run walks straight away without retrying the GET
+    session.calls.clear()
+    wr._sfp_table('127.0.0.1', 'public')
+    assert [c[0] for c in session.calls] == ['getbulk']
+
+
+def test_all_modes_missing_oid(monkeypatch, capsys):
+    # Firmware without the RTU status OID only fails the rtu check
+    agent = switch_agent()
+    del agent[wr.RTU_STATUS_OID]
+    fake_agent(monkeypatch, agent)
+
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '--all'])
+    out = capsys.readouterr().out
+    print(f'\n{out}')
+    assert code == 3
+    assert f'rtu: UNKNOWN - SNMP GET failed for {wr.RTU_STATUS_OID}' in out
+    assert 'swcore: OK: Soft Core status' in out
+    assert 'sfp_wri1_temp=1' in out
+
+
+def test_multiple_modes_failed_walk(monkeypatch, capsys):
+    fake_agent(monkeypatch, switch_agent(), bulk_error='genErr')
+
+    code = run_with_args(monkeypatch, ['-H', '127.0.0.1', '--modes', 'os,disk,pll'])
+    out = capsys.readouterr().out
+    print(f'\n{out}')
+    assert code == 3
+    assert out.startswith('UNKNOWN: os: OK: OS status; disk: UNKNOWN - SNMP BULKWALK failed')
+    assert 'pll: OK: PLL status' in out